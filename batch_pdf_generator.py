@@ -2,66 +2,72 @@ import os
 from reportlab.pdfgen import canvas
 from reportlab.lib.units import inch
 from parse_xml import parse_xml
+from layout_cache import LayoutCache, default_cache
 
+LAYOUT_CACHE_FILE = 'layout_cache.json'  # persisted geometry cache; None to keep it in memory
 
-def draw_imposition_section(c, section, sheet_x, sheet_y):
+
+def _is_true(val):
+    return (val or '').strip().lower() == 'true'
+
+
+def back_side_transform(impo, sheet_x, sheet_y):
+    """
+    Return the (a, b, c, d, e, f) transform, in points, that maps the front
+    side onto the back for work-and-turn (mirror across the sheet width) or
+    work-and-tumble (mirror head to foot). None if the job is neither.
+
+    These are mirrors (determinant -1): fine for the crop-mark layer, which is
+    symmetric per mark, but they would mirror-reverse artwork. Only the mark
+    layer may go through this transform; a reused page XObject needs its
+    cell position mirrored and a 180 degree rotation (or none) instead.
+    """
+    if _is_true(impo.get('work_turn')):
+        return (-1, 0, 0, 1, sheet_x * inch, 0)
+    if _is_true(impo.get('work_tumble')):
+        return (1, 0, 0, -1, 0, sheet_y * inch)
+    return None
+
+
+def draw_imposition_section(c, section, sheet_x, sheet_y, cache=None):
     """
     Draw a single section imposition onto the canvas `c`.
     Marks trimmed cards with crop marks extending outwards from each corner.
+    Offsets and the crop-mark layer come from `cache` (layout_cache), so a
+    repeat geometry is not recomputed.
+    The front marks are drawn once into a form XObject; work-and-turn/tumble
+    backs reuse that form under back_side_transform instead of laying out
+    again. The form holds marks only, never page artwork.
     """
     printing = section['printing']
     impo = printing.get('imposition', {})
 
-    across = int(impo.get('across_x', 0))
-    down = int(impo.get('across_y', 0))
-    size_x = float(impo.get('size_x', 0))
-    size_y = float(impo.get('size_y', 0))
-    printable_x = float(impo.get('printable_x', sheet_x))
-    printable_y = float(impo.get('printable_y', sheet_y))
-    finished_w = float(impo.get('finished_width', 0))
-    finished_h = float(impo.get('finished_height', 0))
-    bleed = float(impo.get('bleed', 0))
-
-    total_w = across * size_x
-    total_h = down * size_y
-    offset_x = (printable_x - total_w) / 2.0 + (sheet_x - printable_x) / 2.0
-    offset_y = (printable_y - total_h) / 2.0 + (sheet_y - printable_y) / 2.0
+    if cache is None:
+        cache = default_cache
+    layout = cache.layout_for(impo, sheet_x, sheet_y)
 
     c.setPageSize((sheet_x * inch, sheet_y * inch))
+    form_name = 'front_side'
+    c.beginForm(form_name, lowerx=0, lowery=0, upperx=sheet_x * inch, uppery=sheet_y * inch)
     c.setLineWidth(1.5)  # 1.5 points thickness
     c.setStrokeColorRGB(0, 0, 0)
 
-    mark_offset = 0.0625 * inch  # 1/16" outside trim edge
-    mark_length = 0.125 * inch   # 1/8" long crop mark
+    # Crop marks at each corner extending out from trim edges
+    c.lines(layout['marks'])
 
-    for row in range(down):
-        for col in range(across):
-            trim_x = (offset_x + col * size_x) * inch
-            trim_y = (offset_y + row * size_y) * inch
-
-            left = trim_x
-            bottom = trim_y
-            right = left + finished_w * inch
-            top = bottom + finished_h * inch
-
-            # Crop marks at each corner extending out from trim edges
-            # Top-left
-            c.line(left - mark_offset, top, left - mark_offset + mark_length, top)
-            c.line(left, top + mark_offset, left, top + mark_offset - mark_length)
-
-            # Top-right
-            c.line(right + mark_offset, top, right + mark_offset - mark_length, top)
-            c.line(right, top + mark_offset, right, top + mark_offset - mark_length)
-
-            # Bottom-left
-            c.line(left - mark_offset, bottom, left - mark_offset + mark_length, bottom)
-            c.line(left, bottom - mark_offset, left, bottom - mark_offset + mark_length)
+    c.endForm()
+    c.doForm(form_name)
+    c.showPage()
 
-            # Bottom-right
-            c.line(right + mark_offset, bottom, right + mark_offset - mark_length, bottom)
-            c.line(right, bottom - mark_offset, right, bottom - mark_offset + mark_length)
+    back = back_side_transform(impo, sheet_x, sheet_y)
+    if back is not None:
+        c.setPageSize((sheet_x * inch, sheet_y * inch))
+        c.saveState()
+        c.transform(*back)
+        c.doForm(form_name)
+        c.restoreState()
+        c.showPage()
 
-    c.showPage()
     c.save()
 
 
@@ -69,6 +75,7 @@ def process_all_xml():
     input_folder = 'XML Files'
     output_folder = 'Output PDFs'
     os.makedirs(output_folder, exist_ok=True)
+    cache = LayoutCache(path=LAYOUT_CACHE_FILE)
 
     for file_name in os.listdir(input_folder):
         if not file_name.lower().endswith('.xml'):
@@ -87,9 +94,12 @@ def process_all_xml():
         output_pdf = os.path.join(output_folder,
                                   f"{os.path.splitext(file_name)[0]}_imposed.pdf")
         c = canvas.Canvas(output_pdf)
-        draw_imposition_section(c, section, sheet_x, sheet_y)
+        draw_imposition_section(c, section, sheet_x, sheet_y, cache)
         print(f"✅ Generated: {output_pdf}")
 
+    cache.save()
+    print(f"Layout cache: {cache.hits} hits, {cache.misses} misses")
+
 
 if __name__ == "__main__":
     process_all_xml()
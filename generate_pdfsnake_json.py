@@ -2,17 +2,28 @@
 import os
 import json
 import glob
-import shutil
 import subprocess
 from pathlib import Path
 import xml.etree.ElementTree as ET
 
+from press_schedule import NO_PRINTING, load_cost_model, schedule_jobs, write_run_list
+from publish import StagedPublisher
+from thumbnails import build_thumbnails, thumbnails_available
+
 # ---- Paths / CLI ----
 PDFSNAKE_CMD = "pdfsnake"             # or absolute path to the CLI
 INPUT_PDF_FOLDER = "PDFs"             # scan PDFs here
 INPUT_JOB_FOLDER = "XML Files"        # expects {JobNumber}.xml (or .json that contains XML)
 OUTPUT_JSON = "PDFSnake_JSON"         # writes {JobNumber}.json here
 OUTPUT_PDF_FOLDER = "PDFSnake_Output" # final imposed PDFs end up here
+CHANGEOVER_COSTS = "press_costs.json" # optional overrides for the scheduler cost model
+REPORT_FOLDER = "PDFSnake_Reports"   # run list + batch manifests; kept out of the RIP hot folder
+RUN_LIST = os.path.join(REPORT_FOLDER, "run_list.csv")
+PUBLISH_STAGING_FOLDER = None         # None = hidden sibling of OUTPUT_PDF_FOLDER (must be same volume)
+PUBLISH_MANIFEST_FOLDER = REPORT_FOLDER  # batch_*.manifest.json completion markers; None to skip
+PUBLISH_BATCH_SIZE = 25               # outputs promoted (and fsynced) together; None = once per run
+THUMBNAIL_FOLDER = "PDFSnake_Thumbs"  # QA thumbnails + contact_sheet.html (needs PyMuPDF); None to skip
+THUMBNAIL_ALL_PAGES = False           # True rasterizes every page, not just page 1
 
 Path(OUTPUT_JSON).mkdir(parents=True, exist_ok=True)
 Path(OUTPUT_PDF_FOLDER).mkdir(parents=True, exist_ok=True)
@@ -75,11 +86,24 @@ def parse_job_fields_from_xmllike(path: str) -> dict:
     # Grips / Bleed (inches)
     grip_x1_in = get_float(root, ".//Imposition/GripX1", 0.0)
     grip_y1_in = get_float(root, ".//Imposition/GripY1", 0.0)
+    grip_x2_in = get_float(root, ".//Imposition/GripX2", grip_x1_in)
+    grip_y2_in = get_float(root, ".//Imposition/GripY2", grip_y1_in)
     bleed_in   = get_float(root, ".//Imposition/Bleed",  0.125)  # default 1/8"
 
-    # Duplex? If reverse process text exists, treat as duplex
+    # Duplex? Reverse process present and not "No Printing" (same rule as the scheduler)
     process_reverse = (get_text(root, ".//Printing/ProcessReverse", "") or "").strip()
-    double_sided = bool(process_reverse)
+    double_sided = process_reverse.lower() not in NO_PRINTING  # "No Printing" is simplex
+
+    # Work-and-turn / work-and-tumble: one plate backs itself, always duplex
+    work_turn = (get_text(root, ".//Imposition/IsWorkAndTurn", "") or "").lower() == "true"
+    work_tumble = (get_text(root, ".//Imposition/IsWorkAndTumble", "") or "").lower() == "true"
+    double_sided = double_sided or work_turn or work_tumble
+
+    # Press fields (used by the scheduler to sequence jobs for least makeready)
+    machine = get_text(root, ".//Printing/Machine", "")
+    stock_code = get_text(root, ".//Printing/StockCode", "")
+    stock_thickness_in = get_float(root, ".//Printing/StockThicknessValue", 0.0)
+    process_front = get_text(root, ".//Printing/ProcessFront", "")
 
     return {
         "job_number": job_number,
@@ -87,19 +111,41 @@ def parse_job_fields_from_xmllike(path: str) -> dict:
         "sheet_h_in": sheet_h_in,
         "grip_x1_in": grip_x1_in,
         "grip_y1_in": grip_y1_in,
+        "grip_x2_in": grip_x2_in,
+        "grip_y2_in": grip_y2_in,
         "bleed_in":   bleed_in,
         "double_sided": double_sided,
+        "work_turn": work_turn,
+        "work_tumble": work_tumble,
+        "machine": machine,
+        "stock_code": stock_code,
+        "stock_thickness_in": stock_thickness_in,
+        "process_front": process_front,
+        "process_reverse": process_reverse,
     }
 
 def make_pdfsnake_payload_from_job(job: dict) -> dict:
     """
     Build the exact JSON structure PDF Snake CLI expects (mirrors Monkey.json).
     All numeric values in points.
+
+    Work-and-turn / work-and-tumble: a step has one leftMargin/topMargin for
+    both sides and no setting for "back = turned/tumbled front", so PDF Snake
+    still takes the backs from the input's page pairs. All this builder does
+    is force doubleSided and use the larger grip on the flipped axis
+    (X for turn, Y for tumble), which keeps the gripper clear on both passes.
+    The input PDF must already carry the backs in the right orientation.
     """
     paper_width_pt  = inches_to_points(job["sheet_w_in"])
     paper_height_pt = inches_to_points(job["sheet_h_in"])
-    left_margin_pt  = inches_to_points(job["grip_x1_in"])
-    top_margin_pt   = inches_to_points(job["grip_y1_in"])
+    grip_x_in = job["grip_x1_in"]
+    grip_y_in = job["grip_y1_in"]
+    if job.get("work_turn"):
+        grip_x_in = max(grip_x_in, job.get("grip_x2_in", grip_x_in))
+    if job.get("work_tumble"):
+        grip_y_in = max(grip_y_in, job.get("grip_y2_in", grip_y_in))
+    left_margin_pt  = inches_to_points(grip_x_in)
+    top_margin_pt   = inches_to_points(grip_y_in)
     bleed_pt        = inches_to_points(job["bleed_in"])
 
     # Match your Monkey.json defaults
@@ -178,11 +224,33 @@ def process_all():
         print(f"No PDFs found in '{INPUT_PDF_FOLDER}'.")
         return
 
-    processed = 0
     missing_job_meta = []
     missing_output = []
     errors = []
 
+    # Outputs go through a staging folder on the output volume (see publish.py)
+    try:
+        publisher = StagedPublisher(OUTPUT_PDF_FOLDER, PUBLISH_STAGING_FOLDER, PUBLISH_MANIFEST_FOLDER)
+    except (OSError, ValueError) as e:
+        print(f" Cannot publish to '{OUTPUT_PDF_FOLDER}': {e}")
+        return
+    if publisher.recovered:
+        print(f" Re-publishing {len(publisher.recovered)} file(s) left staged by a previous run.")
+
+    def publish_batch():
+        published, failed = publisher.commit()
+        for path in published:
+            print(f" Published: {path}")
+        if failed:
+            msg = (f" {len(failed)} file(s) not promoted to '{OUTPUT_PDF_FOLDER}' "
+                   f"(kept in staging, retried next commit): "
+                   + "; ".join(f"{name}: {err}" for name, err in failed))
+            print(msg)
+            errors.append(msg)
+        return published
+
+    # Pass 1: read job meta for every PDF so the batch can be scheduled
+    entries = []
     for pdf_path in sorted(pdf_paths):
         base = pdf_path.stem  # e.g., "J212991-02_1"
         job_number = base.split("_", 1)[0]  # part before first underscore
@@ -203,6 +271,20 @@ def process_all():
             errors.append(msg)
             continue
 
+        entries.append({"pdf_path": pdf_path, "job": job})
+
+    # Sequence the batch to minimize press changeovers (stock, sheet, ink)
+    costs = load_cost_model(CHANGEOVER_COSTS)
+    entries = schedule_jobs(entries, costs)
+
+    # Pass 2: impose in run order, promoting outputs every PUBLISH_BATCH_SIZE files
+    run_rows = []
+    staged_rows = {}
+    for entry in entries:
+        pdf_path = entry["pdf_path"]
+        job = entry["job"]
+        output_pdf = None
+
         # Build and write PDFSnake JSON payload (by job number, one per job spec)
         payload = make_pdfsnake_payload_from_job(job)
         out_json = os.path.join(OUTPUT_JSON, f"{job['job_number']}.json")
@@ -212,19 +294,58 @@ def process_all():
         # Run pdfsnake impose for THIS input PDF
         generated = run_pdfsnake_impose(out_json, str(pdf_path))
         if generated and os.path.isfile(generated):
-            target = os.path.join(OUTPUT_PDF_FOLDER, f"{pdf_path.stem}_imposed.pdf")
+            name = f"{pdf_path.stem}_imposed.pdf"
             try:
-                shutil.move(generated, target)
-                print(f" Generated PDF: {target}")
-                processed += 1
+                output_pdf = publisher.stage(generated, name)
+                print(f" Staged PDF: {name}")
             except Exception as move_err:
-                msg = f" Could not move output ({generated}): {move_err}"
+                msg = f" Could not stage output ({generated}): {move_err}"
                 print(msg)
                 errors.append(msg)
         else:
             print(f" No imposed PDF written for {pdf_path.name}.")
             missing_output.append(pdf_path.name)
 
+        row = {"job": job, "input_pdf": pdf_path.name, "output_pdf": output_pdf}
+        run_rows.append(row)
+        if output_pdf:
+            staged_rows[name] = row
+
+        if PUBLISH_BATCH_SIZE and len(publisher.pending) >= PUBLISH_BATCH_SIZE:
+            publish_batch()
+
+    # Final promote (also retries anything a batch commit left staged)
+    publish_batch()
+    not_published = publisher.pending
+    for name in not_published:
+        if name in staged_rows:
+            staged_rows[name]["output_pdf"] = None
+    processed = sum(1 for row in run_rows if row["output_pdf"])
+
+    if run_rows:
+        try:
+            tmp = RUN_LIST + ".tmp"
+            write_run_list(tmp, run_rows, costs)
+            os.replace(tmp, RUN_LIST)
+            print(f"Run list: {RUN_LIST}")
+        except OSError as e:
+            msg = f" Could not write run list '{RUN_LIST}': {e}"
+            print(msg)
+            errors.append(msg)
+
+    # QA: thumbnail every imposed output onto one contact sheet
+    imposed = [row["output_pdf"] for row in run_rows if row["output_pdf"]]
+    if THUMBNAIL_FOLDER and imposed and not thumbnails_available():
+        print("Thumbnails skipped: PyMuPDF not installed (pip install pymupdf).")
+    elif THUMBNAIL_FOLDER and imposed:
+        try:
+            sheet = build_thumbnails(imposed, THUMBNAIL_FOLDER, all_pages=THUMBNAIL_ALL_PAGES)
+            print(f"Contact sheet: {sheet}")
+        except Exception as e:
+            msg = f" Could not build thumbnails: {e}"
+            print(msg)
+            errors.append(msg)
+
     # Summary
     print("\n--- Summary ---")
     print(f"Processed OK: {processed}")
@@ -232,6 +353,8 @@ def process_all():
         print(f"Missing job XML/JSON for: {', '.join(missing_job_meta)}")
     if missing_output:
         print(f"No output written for: {', '.join(missing_output)}")
+    if not_published:
+        print(f"Not published to '{OUTPUT_PDF_FOLDER}' (still in {publisher.staging_dir}): {', '.join(not_published)}")
     if errors:
         print("Errors:")
         for e in errors:
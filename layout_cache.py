@@ -0,0 +1,180 @@
+# layout_cache.py
+import json
+import os
+from collections import OrderedDict
+from pathlib import Path
+
+POINTS_PER_INCH = 72.0
+MARK_OFFSET_IN = 0.0625  # 1/16" outside trim edge
+MARK_LENGTH_IN = 0.125   # 1/8" long crop mark
+
+# Bump LAYOUT_VERSION whenever compute_layout changes; a persisted cache whose
+# fingerprint differs (algorithm or mark constants) is ignored on load.
+LAYOUT_VERSION = 1
+CACHE_FINGERPRINT = [LAYOUT_VERSION, POINTS_PER_INCH, MARK_OFFSET_IN, MARK_LENGTH_IN]
+
+
+def _num(impo, key, default=0.0):
+    val = impo.get(key)
+    try:
+        return float(val) if val not in (None, '') else float(default)
+    except (TypeError, ValueError):
+        return float(default)
+
+
+def geometry_key(impo, sheet_x, sheet_y, gutter_x=0.0, gutter_y=0.0):
+    """
+    Normalized geometry tuple for an imposition: sheet, printable area,
+    up-count, cell and trim size, bleed, grips and gutters (inches, rounded
+    so '13' and '13.0000' land on the same key).
+    """
+    def r(v):
+        return round(float(v), 4)
+
+    return (
+        r(sheet_x), r(sheet_y),
+        r(_num(impo, 'printable_x', sheet_x)), r(_num(impo, 'printable_y', sheet_y)),
+        int(_num(impo, 'across_x')), int(_num(impo, 'across_y')),
+        r(_num(impo, 'size_x')), r(_num(impo, 'size_y')),
+        r(_num(impo, 'finished_width')), r(_num(impo, 'finished_height')),
+        r(_num(impo, 'bleed')),
+        r(_num(impo, 'grip_x1')), r(_num(impo, 'grip_x2')),
+        r(_num(impo, 'grip_y1')), r(_num(impo, 'grip_y2')),
+        r(gutter_x), r(gutter_y),
+    )
+
+
+def compute_layout(key):
+    """
+    Compute the layout for a geometry_key: centered cell origins (inches,
+    bottom-left origin) and the crop-mark layer as line segments in points,
+    ready for canvas.lines().
+    """
+    (sheet_x, sheet_y, printable_x, printable_y, across, down,
+     size_x, size_y, finished_w, finished_h, bleed,
+     _gx1, _gx2, _gy1, _gy2, gutter_x, gutter_y) = key
+
+    total_w = across * size_x + max(across - 1, 0) * gutter_x
+    total_h = down * size_y + max(down - 1, 0) * gutter_y
+    offset_x = (printable_x - total_w) / 2.0 + (sheet_x - printable_x) / 2.0
+    offset_y = (printable_y - total_h) / 2.0 + (sheet_y - printable_y) / 2.0
+
+    pt = POINTS_PER_INCH
+    mark_offset = MARK_OFFSET_IN * pt
+    mark_length = MARK_LENGTH_IN * pt
+
+    cells = []
+    marks = []
+    for row in range(down):
+        for col in range(across):
+            x = offset_x + col * (size_x + gutter_x)
+            y = offset_y + row * (size_y + gutter_y)
+            cells.append((x, y))
+
+            left = x * pt
+            bottom = y * pt
+            right = left + finished_w * pt
+            top = bottom + finished_h * pt
+
+            marks.extend([
+                # Top-left
+                (left - mark_offset, top, left - mark_offset + mark_length, top),
+                (left, top + mark_offset, left, top + mark_offset - mark_length),
+                # Top-right
+                (right + mark_offset, top, right + mark_offset - mark_length, top),
+                (right, top + mark_offset, right, top + mark_offset - mark_length),
+                # Bottom-left
+                (left - mark_offset, bottom, left - mark_offset + mark_length, bottom),
+                (left, bottom - mark_offset, left, bottom - mark_offset + mark_length),
+                # Bottom-right
+                (right + mark_offset, bottom, right + mark_offset - mark_length, bottom),
+                (right, bottom - mark_offset, right, bottom - mark_offset + mark_length),
+            ])
+
+    return {
+        'total_w': total_w,
+        'total_h': total_h,
+        'offset_x': offset_x,
+        'offset_y': offset_y,
+        'fits': total_w <= printable_x and total_h <= printable_y,
+        'cells': cells,
+        'marks': marks,
+    }
+
+
+class LayoutCache:
+    """
+    Bounded LRU cache of compute_layout results keyed by geometry_key.
+    With `path`, entries are loaded on start and written back by save(),
+    so repeat geometries stay cached across runs.
+    """
+
+    def __init__(self, max_entries=256, path=None):
+        self.max_entries = max_entries
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        if path:
+            self.load()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def layout_for(self, impo, sheet_x, sheet_y, gutter_x=0.0, gutter_y=0.0):
+        """Return the (possibly cached) layout dict for an imposition."""
+        key = geometry_key(impo, sheet_x, sheet_y, gutter_x, gutter_y)
+        layout = self._entries.get(key)
+        if layout is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return layout
+
+        self.misses += 1
+        layout = compute_layout(key)
+        self._entries[key] = layout
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return layout
+
+    def load(self):
+        p = Path(self.path)
+        if not p.is_file():
+            return
+        entries = OrderedDict()
+        try:
+            with open(p, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('fingerprint') != CACHE_FINGERPRINT:
+                # Written by another layout version; its mark layers are stale
+                return
+            for item in data['entries'][-self.max_entries:]:
+                key = tuple(item['key'])
+                if len(key) != len(geometry_key({}, 0, 0)):
+                    raise ValueError(f"bad layout cache key: {item['key']}")
+                layout = dict(item['layout'])
+                layout['cells'] = [tuple(c) for c in layout['cells']]
+                layout['marks'] = [tuple(m) for m in layout['marks']]
+                entries[key] = layout
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            # A corrupt cache only costs a recompute
+            return
+        self._entries = entries
+
+    def save(self):
+        if not self.path:
+            return
+        p = Path(self.path)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            'fingerprint': CACHE_FINGERPRINT,
+            'entries': [{'key': list(k), 'layout': v} for k, v in self._entries.items()],
+        }
+        tmp = p.with_name(p.name + '.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp, p)
+
+
+# Shared in-process cache; scripts that want persistence build their own with a path.
+default_cache = LayoutCache()
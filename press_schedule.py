@@ -0,0 +1,215 @@
+# press_schedule.py
+import csv
+import json
+from pathlib import Path
+
+# ---- Changeover cost model ----
+# Relative makeready cost of going from one job to the next on the same press.
+# Each press runs its own queue, so machine is not a cost: schedule_jobs
+# sequences every machine separately. Override per shop with a JSON file of
+# the same keys (see load_cost_model).
+DEFAULT_CHANGEOVER_COSTS = {
+    "stock": 30.0,      # stock swap (stock code / caliper change)
+    "sheet": 20.0,      # sheet size change (feeder, guides, delivery)
+    "ink": 10.0,        # front/back process change (plates, ink, duplex path)
+}
+
+NO_PRINTING = {"", "no printing", "none"}
+
+# Solver effort: nearest-neighbor starts tried per machine, and how many of the
+# cheapest resulting routes get a 2-opt pass.
+NN_STARTS = 8
+TWO_OPT_ROUTES = 8
+
+
+def load_cost_model(path: str | None = None) -> dict:
+    """
+    Return the changeover cost model: DEFAULT_CHANGEOVER_COSTS, with any keys
+    from the JSON file at `path` overriding the defaults. A file that cannot
+    be read or has non-numeric values is reported and the defaults are used.
+    """
+    costs = dict(DEFAULT_CHANGEOVER_COSTS)
+    if path and Path(path).is_file():
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                overrides = json.load(f)
+            for key, val in overrides.items():
+                if key in costs:
+                    costs[key] = float(val)
+        except (OSError, ValueError, AttributeError, TypeError) as e:
+            print(f" Ignoring cost model '{path}' ({e}); using default changeover costs.")
+            return dict(DEFAULT_CHANGEOVER_COSTS)
+    return costs
+
+
+def _norm(val) -> str:
+    return (val or "").strip().lower()
+
+
+def _process(val) -> str:
+    p = _norm(val)
+    return "" if p in NO_PRINTING else p
+
+
+def press_profile(job: dict) -> tuple:
+    """
+    Reduce a job (as returned by parse_job_fields_from_xmllike) to the fields
+    that drive makeready on one press: (stock, sheet size, process front/reverse).
+    Jobs with equal profiles can run back-to-back with no changeover.
+    Sheet size keeps (width, depth) order: 12x18 and 18x12 feed differently.
+    """
+    stock = _norm(job.get("stock_code")) or f"{float(job.get('stock_thickness_in') or 0.0):.4f}"
+    sheet = (round(float(job.get("sheet_w_in") or 0.0), 3),
+             round(float(job.get("sheet_h_in") or 0.0), 3))
+    return (
+        stock,
+        sheet,
+        (_process(job.get("process_front")), _process(job.get("process_reverse"))),
+    )
+
+
+def changeover_cost(a: tuple, b: tuple, costs: dict) -> float:
+    """Makeready cost of running profile `b` directly after profile `a`."""
+    stock_a, sheet_a, ink_a = a
+    stock_b, sheet_b, ink_b = b
+    cost = 0.0
+    if stock_a != stock_b:
+        cost += costs["stock"]
+    if sheet_a != sheet_b:
+        cost += costs["sheet"]
+    if ink_a != ink_b:
+        cost += costs["ink"]
+    return cost
+
+
+def _cost_matrix(profiles: list, costs: dict) -> list:
+    return [[changeover_cost(a, b, costs) for b in profiles] for a in profiles]
+
+
+def _route_cost(route: list, cm: list) -> float:
+    return sum(cm[i][j] for i, j in zip(route, route[1:]))
+
+
+def _nearest_neighbor(start: int, cm: list) -> list:
+    route = [start]
+    remaining = set(range(len(cm))) - {start}
+    while remaining:
+        row = cm[route[-1]]
+        # Ties go to the lowest index, i.e. first-seen order
+        nxt = min(remaining, key=lambda k: (row[k], k))
+        route.append(nxt)
+        remaining.remove(nxt)
+    return route
+
+
+def _two_opt(route: list, cm: list) -> list:
+    """Reverse segments of an open route while that lowers total changeover cost."""
+    n = len(route)
+    improved = True
+    while improved:
+        improved = False
+        for i in range(n - 1):
+            prev = route[i - 1] if i > 0 else None
+            for j in range(i + 1, n):
+                nxt = route[j + 1] if j + 1 < n else None
+                # Reversing route[i..j]: only the edge into i and out of j change
+                before = (cm[prev][route[i]] if prev is not None else 0.0) + \
+                         (cm[route[j]][nxt] if nxt is not None else 0.0)
+                after = (cm[prev][route[j]] if prev is not None else 0.0) + \
+                        (cm[route[i]][nxt] if nxt is not None else 0.0)
+                if after < before - 1e-9:
+                    route[i:j + 1] = reversed(route[i:j + 1])
+                    improved = True
+    return route
+
+
+def machine_of(job: dict) -> str:
+    """Press a job runs on; each machine gets its own queue."""
+    return _norm(job.get("machine"))
+
+
+def _schedule_one_machine(entries: list, costs: dict, key) -> list:
+    groups = {}
+    for entry in entries:
+        groups.setdefault(press_profile(key(entry)), []).append(entry)
+    profiles = list(groups)
+    if len(profiles) < 2:
+        return list(entries)
+
+    cm = _cost_matrix(profiles, costs)
+    # Spread the nearest-neighbor starts across the batch
+    n = len(profiles)
+    starts = sorted({i * n // min(n, NN_STARTS) for i in range(min(n, NN_STARTS))})
+    routes = sorted((_nearest_neighbor(s, cm) for s in starts), key=lambda r: _route_cost(r, cm))
+
+    best = None
+    best_cost = None
+    for route in routes[:TWO_OPT_ROUTES]:
+        route = _two_opt(route, cm)
+        cost = _route_cost(route, cm)
+        if best_cost is None or cost < best_cost:
+            best, best_cost = route, cost
+
+    return [entry for idx in best for entry in groups[profiles[idx]]]
+
+
+def schedule_jobs(entries: list, costs: dict | None = None, key=lambda e: e["job"]) -> list:
+    """
+    Order `entries` to minimize total changeover cost on each press.
+
+    Entries are split by machine (presses run in parallel, so interleaving
+    them means nothing) and the result is one block per machine, in order of
+    first appearance. Within a machine, entries are grouped by press_profile
+    (same-profile jobs cost nothing to chain) and the groups are sequenced
+    with nearest-neighbor from up to NN_STARTS starts over a precomputed cost
+    matrix, then 2-opt on the TWO_OPT_ROUTES cheapest routes. Within a group
+    the incoming order is kept, so the result is deterministic.
+    """
+    if costs is None:
+        costs = DEFAULT_CHANGEOVER_COSTS
+
+    machines = {}
+    for entry in entries:
+        machines.setdefault(machine_of(key(entry)), []).append(entry)
+
+    return [entry for queue in machines.values()
+            for entry in _schedule_one_machine(queue, costs, key)]
+
+
+def write_run_list(out_path: str, rows: list, costs: dict | None = None) -> None:
+    """
+    Write the press run list as CSV, one row per imposed output, in run order.
+    `rows` are dicts with 'job', 'input_pdf' and 'output_pdf' (None if imposing failed).
+    `seq` and changeover_cost restart for each machine: every press has its own queue.
+    """
+    if costs is None:
+        costs = DEFAULT_CHANGEOVER_COSTS
+    Path(out_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(out_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow([
+            "seq", "job_number", "input_pdf", "output_pdf", "machine", "stock_code",
+            "sheet_w_in", "sheet_h_in", "process_front", "process_reverse", "changeover_cost",
+        ])
+        seq = {}
+        prev = {}
+        for row in rows:
+            job = row["job"]
+            machine = machine_of(job)
+            seq[machine] = seq.get(machine, 0) + 1
+            profile = press_profile(job)
+            cost = changeover_cost(prev[machine], profile, costs) if machine in prev else 0.0
+            prev[machine] = profile
+            writer.writerow([
+                seq[machine],
+                job["job_number"],
+                row["input_pdf"],
+                row.get("output_pdf") or "",
+                job.get("machine") or "",
+                job.get("stock_code") or "",
+                job.get("sheet_w_in"),
+                job.get("sheet_h_in"),
+                job.get("process_front") or "",
+                job.get("process_reverse") or "",
+                cost,
+            ])
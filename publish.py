@@ -0,0 +1,169 @@
+# publish.py
+import json
+import os
+import shutil
+import time
+import uuid
+from pathlib import Path
+
+PART_SUFFIX = ".part"  # cross-volume copies in progress; never promoted
+
+
+def default_staging_dir(dest_dir: str) -> str:
+    """
+    Hidden sibling of `dest_dir`, e.g. 'PDFSnake_Output' -> '.PDFSnake_Output_staging'.
+    Outside the hot folder (so recursive scanners never see it), but normally
+    on the same volume so promotion is a rename.
+    """
+    dest = Path(dest_dir).resolve()
+    return str(dest.parent / f".{dest.name}_staging")
+
+
+def _fsync_file(path: str) -> None:
+    # "rb+" so os.fsync also works on Windows (needs a writable handle)
+    with open(path, "rb+") as f:
+        os.fsync(f.fileno())
+
+
+def _fsync_dir(path: str) -> None:
+    # Directory fsync makes the renames durable; not supported on Windows
+    if os.name != "posix":
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class StagedPublisher:
+    """
+    Publish files into `dest_dir` without downstream hot folders ever seeing
+    a partial file.
+
+    stage() brings each file into `staging_dir` (a rename when the source is
+    on the destination volume, one copy otherwise). commit() fsyncs what is
+    staged in one pass, promotes each file with os.replace, fsyncs the
+    destination directory once and, with `manifest_dir`, writes a manifest
+    for the batch there last. A file whose fsync or promote fails stays
+    staged and is retried by the next commit().
+
+    Files left in staging by an interrupted run are picked up on start and
+    promoted by the first commit().
+    """
+
+    def __init__(self, dest_dir: str, staging_dir: str | None = None, manifest_dir: str | None = None):
+        self.dest_dir = str(dest_dir)
+        self.staging_dir = str(staging_dir or default_staging_dir(self.dest_dir))
+        self.manifest_dir = manifest_dir
+        self.published = []
+        self.recovered = []
+        self._staged = []
+        self._batches = 0
+        Path(self.dest_dir).mkdir(parents=True, exist_ok=True)
+        Path(self.staging_dir).mkdir(parents=True, exist_ok=True)
+        if os.stat(self.staging_dir).st_dev != os.stat(self.dest_dir).st_dev:
+            raise ValueError(
+                f"Staging folder '{self.staging_dir}' is not on the same volume as "
+                f"'{self.dest_dir}'; os.replace cannot promote atomically. "
+                f"Pass a staging_dir on the destination volume."
+            )
+        self._recover()
+
+    @property
+    def pending(self) -> list[str]:
+        """Names staged but not yet promoted."""
+        return list(self._staged)
+
+    def _recover(self) -> None:
+        for p in sorted(Path(self.staging_dir).iterdir()):
+            if not p.is_file():
+                continue
+            if p.name.endswith(PART_SUFFIX):
+                p.unlink()  # interrupted copy; its source was never removed
+            else:
+                self._staged.append(p.name)
+                self.recovered.append(p.name)
+
+    def staging_path(self, name: str) -> str:
+        return os.path.join(self.staging_dir, name)
+
+    def stage(self, src: str, name: str | None = None) -> str:
+        """
+        Move `src` into staging as `name` (default: its basename). Returns the
+        path it will have once committed.
+        """
+        name = name or os.path.basename(src)
+        staged = self.staging_path(name)
+        try:
+            os.replace(src, staged)  # same volume: just a rename
+        except OSError:
+            # Cross-volume: one copy onto the destination volume, as .part
+            # until complete so recovery never promotes a torn file
+            part = staged + PART_SUFFIX
+            shutil.copyfile(src, part)
+            os.replace(part, staged)
+            os.remove(src)
+        if name not in self._staged:
+            self._staged.append(name)
+        return os.path.join(self.dest_dir, name)
+
+    def commit(self) -> tuple[list[str], list[tuple[str, str]]]:
+        """
+        Durably promote everything staged. Returns (promoted paths,
+        [(name, error)] for files that stay staged).
+        """
+        if not self._staged:
+            return [], []
+
+        failed = {}
+        for name in self._staged:
+            try:
+                _fsync_file(self.staging_path(name))
+            except OSError as e:
+                failed[name] = f"fsync failed: {e}"
+
+        promoted = []
+        for name in list(self._staged):
+            if name in failed:
+                continue
+            try:
+                os.replace(self.staging_path(name), os.path.join(self.dest_dir, name))
+            except OSError as e:
+                failed[name] = f"promote failed: {e}"
+                continue
+            self._staged.remove(name)
+            promoted.append(name)
+
+        if promoted:
+            _fsync_dir(self.dest_dir)
+            self._batches += 1
+            final = [os.path.join(self.dest_dir, n) for n in promoted]
+            self.published.extend(final)
+            if self.manifest_dir:
+                self._write_manifest(promoted)
+        else:
+            final = []
+        return final, list(failed.items())
+
+    def _write_manifest(self, names: list) -> None:
+        """Completion marker for consumers: lists the batch's files, written after they are in place."""
+        Path(self.manifest_dir).mkdir(parents=True, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        # pid + random suffix: publishers committing in the same second must not collide
+        manifest_name = f"batch_{stamp}_{os.getpid()}_{uuid.uuid4().hex[:8]}_{self._batches:03d}.manifest.json"
+        data = {
+            "completed": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "dest_dir": os.path.abspath(self.dest_dir),
+            "files": [
+                {"name": n, "bytes": os.path.getsize(os.path.join(self.dest_dir, n))}
+                for n in names
+            ],
+        }
+        out = os.path.join(self.manifest_dir, manifest_name)
+        tmp = out + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, out)
@@ -0,0 +1,124 @@
+# thumbnails.py
+import hashlib
+import html
+import importlib.util
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+THUMB_DPI = 24          # low-res: a 13x19 sheet comes out ~312x456 px
+CONTACT_SHEET = "contact_sheet.html"
+
+# Per-process renderer, set up once by _init_worker
+_fitz = None
+_matrix = None
+
+
+def _init_worker(dpi: int) -> None:
+    """Process pool initializer: import the renderer once per worker."""
+    global _fitz, _matrix
+    import fitz  # PyMuPDF
+    _fitz = fitz
+    _matrix = fitz.Matrix(dpi / 72.0, dpi / 72.0)
+
+
+def thumbnails_available() -> bool:
+    """True if the PyMuPDF renderer is installed."""
+    return importlib.util.find_spec("fitz") is not None
+
+
+def file_hash(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _render_one(pdf_path: str, thumb_dir: str, dpi: int, all_pages: bool) -> list[str]:
+    """
+    Rasterize page 1 (or every page) of one PDF to PNG. Thumbnails are named
+    by the PDF's content hash, so an unchanged output is never re-rendered.
+    """
+    digest = file_hash(pdf_path)[:16]
+    first = Path(thumb_dir) / f"{digest}_{dpi}_p1.png"
+    if first.is_file() and not all_pages:
+        return [str(first)]
+
+    pngs = []
+    with _fitz.open(pdf_path) as doc:
+        pages = range(doc.page_count) if all_pages else range(min(1, doc.page_count))
+        for i in pages:
+            out = Path(thumb_dir) / f"{digest}_{dpi}_p{i + 1}.png"
+            if not out.is_file():
+                # Per-process tmp: identical PDFs in one batch share a digest
+                tmp = out.with_name(f"{out.stem}.{os.getpid()}.tmp.png")
+                doc[i].get_pixmap(matrix=_matrix, alpha=False).save(str(tmp))
+                os.replace(tmp, out)
+            pngs.append(str(out))
+    return pngs
+
+
+def write_contact_sheet(out_path: str, results: list) -> None:
+    """Write one static HTML page showing every thumbnail, in batch order."""
+    base = Path(out_path).parent
+    cells = []
+    for pdf_path, pngs, error in results:
+        name = html.escape(Path(pdf_path).name)
+        if error:
+            imgs = f'<div class="err">{html.escape(error)}</div>'
+        else:
+            imgs = "".join(
+                f'<img src="{html.escape(os.path.relpath(p, base).replace(os.sep, "/"))}" loading="lazy">'
+                for p in pngs
+            )
+        cells.append(f'<figure>{imgs}<figcaption>{name}</figcaption></figure>')
+
+    page = (
+        "<!doctype html>\n<html><head><meta charset=\"utf-8\"><title>Imposed output QA</title>\n"
+        "<style>body{font-family:sans-serif;background:#ddd}"
+        "figure{display:inline-block;vertical-align:top;margin:6px;padding:6px;background:#fff}"
+        "img{display:block;max-height:320px;border:1px solid #999;margin-bottom:4px}"
+        "figcaption{font-size:12px;max-width:260px;word-break:break-all}"
+        ".err{color:#b00;max-width:260px}</style></head><body>\n"
+        f"<h3>{len(results)} imposed files</h3>\n"
+        + "\n".join(cells)
+        + "\n</body></html>\n"
+    )
+    Path(out_path).parent.mkdir(parents=True, exist_ok=True)
+    Path(out_path).write_text(page, encoding="utf-8")
+
+
+def build_thumbnails(pdf_paths: list, thumb_dir: str, dpi: int = THUMB_DPI,
+                     all_pages: bool = False, workers: int | None = None) -> str:
+    """
+    Rasterize imposed PDFs across a process pool and write the batch contact
+    sheet into `thumb_dir`. Returns the contact sheet path.
+    """
+    if not thumbnails_available():
+        raise ImportError("PyMuPDF is required for thumbnails (pip install pymupdf)")
+
+    Path(thumb_dir).mkdir(parents=True, exist_ok=True)
+    pdf_paths = [str(p) for p in pdf_paths]
+
+    results = []
+    if pdf_paths:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(dpi,)) as pool:
+            futures = [pool.submit(_render_one, p, thumb_dir, dpi, all_pages) for p in pdf_paths]
+            for pdf_path, fut in zip(pdf_paths, futures):
+                try:
+                    results.append((pdf_path, fut.result(), None))
+                except Exception as e:
+                    results.append((pdf_path, [], f"Thumbnail failed: {e}"))
+
+    out_path = os.path.join(thumb_dir, CONTACT_SHEET)
+    write_contact_sheet(out_path, results)
+    return out_path
+
+
+if __name__ == "__main__":
+    import sys
+    folder = sys.argv[1] if len(sys.argv) > 1 else "PDFSnake_Output"
+    pdfs = sorted(p for p in Path(folder).iterdir() if p.is_file() and p.suffix.lower() == ".pdf")
+    sheet = build_thumbnails(pdfs, sys.argv[2] if len(sys.argv) > 2 else "PDFSnake_Thumbs")
+    print(f"Contact sheet: {sheet}")